@@ -9,16 +9,58 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import re
 import sqlite3
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from io import BytesIO
+from itertools import chain, islice
+from operator import attrgetter
 from typing import Iterable
 from urllib.request import Request, urlopen
 from xml.etree import ElementTree
 
-
-@dataclass(frozen=True)
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:  # pragma: no cover - optional speedup
+    simdjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - optional speedup
+    ujson = None
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:  # pragma: no cover - optional speedup
+    requests = None
+
+USER_AGENT = "job-etl-bot/1.0"
+
+# Use the fastest JSON parser that is installed; every candidate accepts bytes.
+# pysimdjson is not a candidate: when it is installed, fetch_json_lazy parses
+# with it directly and fetch_json is never reached.
+if orjson is not None:
+    _json_loads = orjson.loads
+elif ujson is not None:
+    _json_loads = ujson.loads
+else:
+    _json_loads = json.loads
+
+
+@dataclass(frozen=True, slots=True)
 class JobRecord:
     source: str
     source_id: str
@@ -32,6 +74,27 @@ class JobRecord:
     description: str
 
 
+_FIELD_NAMES = tuple(JobRecord.__annotations__)
+# Returns a record's values as a tuple in _FIELD_NAMES order.
+_record_values = attrgetter(*_FIELD_NAMES)
+
+# Output files are written through a 1 MiB buffer to cut down on write calls.
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Rows per multi-row INSERT; SQLite before 3.32 allows at most 999 parameters.
+_SQLITE_BATCH_ROWS = 500 if sqlite3.sqlite_version_info >= (3, 32, 0) else 99
+# ON CONFLICT ... DO UPDATE needs SQLite 3.24 or newer.
+_SQLITE_HAS_UPSERT = sqlite3.sqlite_version_info >= (3, 24, 0)
+
+
+# simdjson parsers are meant to be reused but not shared between threads, and
+# portals are extracted concurrently, so each worker thread keeps its own.
+_THREAD_STATE = threading.local()
+_JSON_OBJECT_TYPES: tuple[type, ...] = (
+    (dict, simdjson.Object) if simdjson is not None else (dict,)
+)
+
+
 class JobPortal:
     name: str
 
@@ -44,21 +107,21 @@ class RemotivePortal(JobPortal):
     endpoint = "https://remotive.com/api/remote-jobs"
 
     def extract(self) -> list[JobRecord]:
-        payload = fetch_json(self.endpoint)
+        payload = fetch_json_lazy(self.endpoint)
         records: list[JobRecord] = []
         for job in payload.get("jobs", []):
             records.append(
                 JobRecord(
                     source=self.name,
                     source_id=str(job.get("id", "")),
-                    title=job.get("title", ""),
-                    company=job.get("company_name", ""),
-                    location=job.get("candidate_required_location", ""),
-                    url=job.get("url", ""),
-                    tags=", ".join(job.get("tags", [])),
-                    date_posted=job.get("publication_date", ""),
-                    salary=job.get("salary", ""),
-                    description=job.get("description", ""),
+                    title=job.get("title", "").strip(),
+                    company=job.get("company_name", "").strip(),
+                    location=job.get("candidate_required_location", "").strip(),
+                    url=job.get("url", "").strip(),
+                    tags=", ".join(job.get("tags", [])).strip(),
+                    date_posted=normalize_date(job.get("publication_date", "")),
+                    salary=job.get("salary", "").strip(),
+                    description=job.get("description", "").strip(),
                 )
             )
         return records
@@ -69,23 +132,27 @@ class RemoteOkPortal(JobPortal):
     endpoint = "https://remoteok.com/api"
 
     def extract(self) -> list[JobRecord]:
-        payload = fetch_json(self.endpoint)
+        payload = fetch_json_lazy(self.endpoint)
         records: list[JobRecord] = []
         for job in payload:
-            if not isinstance(job, dict) or "id" not in job:
+            if not isinstance(job, _JSON_OBJECT_TYPES) or "id" not in job:
                 continue
             records.append(
                 JobRecord(
                     source=self.name,
                     source_id=str(job.get("id", "")),
-                    title=job.get("position", ""),
-                    company=job.get("company", ""),
-                    location=job.get("location", ""),
-                    url=job.get("url", ""),
-                    tags=", ".join(job.get("tags", [])),
-                    date_posted=str(job.get("date_epoch", job.get("date", ""))),
-                    salary=str(job.get("salary", "")) if job.get("salary") else "",
-                    description=job.get("description", ""),
+                    title=job.get("position", "").strip(),
+                    company=job.get("company", "").strip(),
+                    location=job.get("location", "").strip(),
+                    url=job.get("url", "").strip(),
+                    tags=", ".join(job.get("tags", [])).strip(),
+                    date_posted=normalize_date(
+                        str(job.get("date_epoch", job.get("date", "")))
+                    ),
+                    salary=(
+                        str(job.get("salary", "")).strip() if job.get("salary") else ""
+                    ),
+                    description=job.get("description", "").strip(),
                 )
             )
         return records
@@ -96,70 +163,84 @@ class WeWorkRemotelyPortal(JobPortal):
     endpoint = "https://weworkremotely.com/remote-jobs.rss"
 
     def extract(self) -> list[JobRecord]:
-        xml_text = fetch_text(self.endpoint)
-        root = ElementTree.fromstring(xml_text)
+        feed = BytesIO(fetch_bytes(self.endpoint))
         records: list[JobRecord] = []
-        for item in root.findall("./channel/item"):
-            title = text_of(item, "title")
-            link = text_of(item, "link")
-            pub_date = text_of(item, "pubDate")
-            company = text_of(item, "company")
-            location = text_of(item, "region")
-            tags = text_of(item, "category")
-            description = text_of(item, "description")
-            source_id = link.rsplit("/", 1)[-1]
+        # Parse incrementally and detach each item from its parent once read,
+        # so the element tree stays small while the feed is walked. The raw
+        # response bytes are still held in memory.
+        open_elements: list[ElementTree.Element] = []
+        for event, item in ElementTree.iterparse(feed, events=("start", "end")):
+            if event == "start":
+                open_elements.append(item)
+                continue
+            open_elements.pop()
+            if item.tag != "item":
+                continue
+            # Read every child once; the first element wins for repeated tags
+            # such as <category>, as it did with find().
+            fields: dict[str, str] = {}
+            for child in item:
+                fields.setdefault(child.tag, (child.text or "").strip())
+            link = fields.get("link", "")
             records.append(
                 JobRecord(
                     source=self.name,
-                    source_id=source_id,
-                    title=title,
-                    company=company,
-                    location=location,
+                    source_id=link.rsplit("/", 1)[-1],
+                    title=fields.get("title", ""),
+                    company=fields.get("company", ""),
+                    location=fields.get("region", ""),
                     url=link,
-                    tags=tags,
-                    date_posted=pub_date,
+                    tags=fields.get("category", ""),
+                    date_posted=normalize_date(fields.get("pubDate", "")),
                     salary="",
-                    description=description,
+                    description=fields.get("description", ""),
                 )
             )
+            if open_elements:
+                open_elements[-1].remove(item)
         return records
 
 
-def fetch_json(url: str) -> dict | list:
-    request = Request(url, headers={"User-Agent": "job-etl-bot/1.0"})
-    with urlopen(request, timeout=30) as response:
-        return json.loads(response.read().decode("utf-8"))
+def build_session():
+    """Create a requests session that keeps connections alive between calls."""
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = build_session() if requests is not None else None
 
 
-def fetch_text(url: str) -> str:
-    request = Request(url, headers={"User-Agent": "job-etl-bot/1.0"})
+def fetch_bytes(url: str) -> bytes:
+    if _SESSION is not None:
+        response = _SESSION.get(url, timeout=30)
+        response.raise_for_status()
+        return response.content
+    request = Request(url, headers={"User-Agent": USER_AGENT})
     with urlopen(request, timeout=30) as response:
-        return response.read().decode("utf-8")
-
-
-def text_of(parent: ElementTree.Element, tag: str) -> str:
-    element = parent.find(tag)
-    return element.text.strip() if element is not None and element.text else ""
-
-
-def transform(records: Iterable[JobRecord]) -> list[JobRecord]:
-    cleaned: list[JobRecord] = []
-    for record in records:
-        cleaned.append(
-            JobRecord(
-                source=record.source,
-                source_id=record.source_id,
-                title=record.title.strip(),
-                company=record.company.strip(),
-                location=record.location.strip(),
-                url=record.url.strip(),
-                tags=record.tags.strip(),
-                date_posted=normalize_date(record.date_posted),
-                salary=record.salary.strip(),
-                description=record.description.strip(),
-            )
-        )
-    return cleaned
+        return response.read()
+
+
+def fetch_json(url: str) -> dict | list:
+    return _json_loads(fetch_bytes(url))
+
+
+def fetch_json_lazy(url: str):
+    """Fetch a JSON document, materializing values only as they are accessed.
+
+    Uses the calling thread's simdjson parser when available, so the returned
+    document is only valid until the next call on that thread. Falls back to
+    fetch_json otherwise.
+    """
+    if simdjson is None:
+        return fetch_json(url)
+    parser = getattr(_THREAD_STATE, "simdjson_parser", None)
+    if parser is None:
+        parser = _THREAD_STATE.simdjson_parser = simdjson.Parser()
+    return parser.parse(fetch_bytes(url))
 
 
 def normalize_date(value: str) -> str:
@@ -171,61 +252,171 @@ def normalize_date(value: str) -> str:
     return parsed.date().isoformat()
 
 
+# Compiled equivalents of the strptime formats "%Y-%m-%dT%H:%M:%S%z",
+# "%a, %d %b %Y %H:%M:%S %z" and "%Y-%m-%d"; strptime re-derives its regex and
+# raises on every format that does not match, which dominates parsing time.
+_UTC_OFFSET = r"(?-i:Z)|[+-]\d{2}:?[0-5]\d(?::?[0-5]\d(?:\.\d{1,6})?)?"
+_ISO_DATETIME_RE = re.compile(
+    r"(\d{4})-(\d{1,2})-(\d{1,2})T(\d{1,2}):(\d{1,2}):(\d{1,2})"
+    r"(" + _UTC_OFFSET + r")\Z",
+    re.IGNORECASE,
+)
+_RFC2822_RE = re.compile(
+    r"(?:mon|tue|wed|thu|fri|sat|sun),\s+(\d{1,2})\s+([a-z]{3})\s+(\d{4})"
+    r"\s+(\d{1,2}):(\d{1,2}):(\d{1,2})\s+(" + _UTC_OFFSET + r")\Z",
+    re.IGNORECASE,
+)
+_DATE_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})\Z")
+_MONTHS = {
+    name: number
+    for number, name in enumerate(
+        "jan feb mar apr may jun jul aug sep oct nov dec".split(), start=1
+    )
+}
+
+
+# Many listings share a posting date, and parsing is far slower than a lookup.
+@lru_cache(maxsize=4096)
 def parse_datetime(value: str) -> datetime | None:
     if not value:
         return None
     if value.isdigit():
-        return datetime.utcfromtimestamp(int(value))
-    for fmt in ("%Y-%m-%dT%H:%M:%S%z", "%a, %d %b %Y %H:%M:%S %z", "%Y-%m-%d"):
-        try:
-            return datetime.strptime(value, fmt)
-        except ValueError:
-            continue
+        return datetime.fromtimestamp(int(value), timezone.utc)
+    try:
+        match = _ISO_DATETIME_RE.match(value)
+        if match:
+            *fields, offset = match.groups()
+            return datetime(*map(int, fields), tzinfo=parse_utc_offset(offset))
+        match = _RFC2822_RE.match(value)
+        if match:
+            day, month_name, year, hour, minute, second, offset = match.groups()
+            month = _MONTHS.get(month_name.lower())
+            if month is None:
+                return None
+            return datetime(
+                int(year),
+                month,
+                int(day),
+                int(hour),
+                int(minute),
+                int(second),
+                tzinfo=parse_utc_offset(offset),
+            )
+        match = _DATE_RE.match(value)
+        if match:
+            return datetime(*map(int, match.groups()))
+    except ValueError:
+        return None
     return None
 
 
+def parse_timestamp(value: str) -> float | None:
+    """Return the POSIX timestamp for a date string, or None if it cannot be parsed."""
+    parsed = parse_datetime(value)
+    return parsed.timestamp() if parsed is not None else None
+
+
+def parse_utc_offset(value: str) -> timezone:
+    """Convert a %z style offset (Z, +HHMM, +HH:MM[:SS[.ffffff]]) to a timezone."""
+    if value == "Z":
+        return timezone.utc
+    if value[3] == ":":
+        value = value[:3] + value[4:]
+        if len(value) > 5:
+            if value[5] != ":":
+                raise ValueError(f"Inconsistent use of : in UTC offset {value!r}")
+            value = value[:5] + value[6:]
+    offset = timedelta(
+        hours=int(value[1:3]),
+        minutes=int(value[3:5]),
+        seconds=int(value[5:7] or 0),
+        microseconds=int(value[8:].ljust(6, "0")),
+    )
+    return timezone(-offset if value[0] == "-" else offset)
+
+
 def load_to_csv(records: Iterable[JobRecord], path: str) -> None:
-    with open(path, "w", newline="", encoding="utf-8") as handle:
+    with open(
+        path, "w", newline="", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE
+    ) as handle:
         writer = csv.writer(handle)
-        writer.writerow(JobRecord.__annotations__.keys())
-        for record in records:
-            writer.writerow(record.__dict__.values())
+        writer.writerow(_FIELD_NAMES)
+        writer.writerows(map(_record_values, records))
 
 
 def load_to_jsonl(records: Iterable[JobRecord], path: str) -> None:
-    with open(path, "w", encoding="utf-8") as handle:
-        for record in records:
-            handle.write(json.dumps(record.__dict__, ensure_ascii=False) + "\n")
+    with open(path, "wb", buffering=_WRITE_BUFFER_SIZE) as handle:
+        if orjson is not None:
+            # orjson serializes dataclasses natively, slots included, and can
+            # append the newline itself so each line is a single bytes object.
+            option = orjson.OPT_APPEND_NEWLINE
+            handle.writelines(orjson.dumps(record, option=option) for record in records)
+        else:
+            for record in records:
+                data = dict(zip(_FIELD_NAMES, _record_values(record)))
+                line = json.dumps(data, ensure_ascii=False) + "\n"
+                handle.write(line.encode("utf-8"))
 
 
 def load_to_sqlite(records: Iterable[JobRecord], path: str) -> None:
-    with sqlite3.connect(path) as conn:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS jobs (
-                source TEXT,
-                source_id TEXT,
-                title TEXT,
-                company TEXT,
-                location TEXT,
-                url TEXT,
-                tags TEXT,
-                date_posted TEXT,
-                salary TEXT,
-                description TEXT,
-                PRIMARY KEY (source, source_id)
+    with closing(sqlite3.connect(path)) as conn:
+        # WAL with synchronous=NORMAL drops the fsync on every commit while
+        # staying safe against application crashes.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        with conn:
+            # sqlite3 does not open a transaction before DDL on its own, so
+            # begin one explicitly to cover table creation and the inserts.
+            conn.execute("BEGIN")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    source TEXT,
+                    source_id TEXT,
+                    title TEXT,
+                    company TEXT,
+                    location TEXT,
+                    url TEXT,
+                    tags TEXT,
+                    date_posted TEXT,
+                    salary TEXT,
+                    description TEXT,
+                    PRIMARY KEY (source, source_id)
+                )
+                """
             )
-            """
-        )
-        conn.executemany(
-            """
-            INSERT OR REPLACE INTO jobs (
-                source, source_id, title, company, location, url, tags, date_posted, salary, description
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            [tuple(record.__dict__.values()) for record in records],
-        )
-        conn.commit()
+            rows = map(_record_values, records)
+            batch_sql = build_upsert_sql(_SQLITE_BATCH_ROWS)
+            while batch := list(islice(rows, _SQLITE_BATCH_ROWS)):
+                if len(batch) < _SQLITE_BATCH_ROWS:
+                    batch_sql = build_upsert_sql(len(batch))
+                conn.execute(batch_sql, list(chain.from_iterable(batch)))
+
+
+def build_upsert_sql(row_count: int) -> str:
+    """Build a multi-row upsert into jobs for row_count rows of parameters.
+
+    Existing rows are only rewritten when one of their values changed. SQLite
+    before 3.24 has no upsert, so it falls back to INSERT OR REPLACE there.
+    """
+    columns = ", ".join(_FIELD_NAMES)
+    placeholders = "(" + ", ".join("?" * len(_FIELD_NAMES)) + ")"
+    values = ", ".join([placeholders] * row_count)
+    if not _SQLITE_HAS_UPSERT:
+        return f"INSERT OR REPLACE INTO jobs ({columns}) VALUES {values}"
+    data_columns = [
+        name for name in _FIELD_NAMES if name not in ("source", "source_id")
+    ]
+    updates = ", ".join(f"{name} = excluded.{name}" for name in data_columns)
+    changed = " OR ".join(
+        f"jobs.{name} IS NOT excluded.{name}" for name in data_columns
+    )
+    return (
+        f"INSERT INTO jobs ({columns}) "
+        f"VALUES {values} "
+        f"ON CONFLICT (source, source_id) DO UPDATE SET {updates} WHERE {changed}"
+    )
 
 
 PORTALS: dict[str, JobPortal] = {
@@ -236,14 +427,24 @@ PORTALS: dict[str, JobPortal] = {
 
 
 def run_etl(selected: list[str], output: str, fmt: str, titles: list[str]) -> int:
-    records: list[JobRecord] = []
+    portals: list[JobPortal] = []
     for name in selected:
         portal = PORTALS.get(name)
         if portal is None:
             raise ValueError(f"Unknown portal: {name}")
-        records.extend(portal.extract())
-    cleaned = transform(records)
-    filtered = filter_jobs(cleaned, titles)
+        portals.append(portal)
+
+    # Extraction is dominated by network I/O, so fetch every portal at once.
+    # Duplicates are keyed on (source, source_id) and the last record wins,
+    # matching the SQLite upsert. The key includes the source, so the same job
+    # cross-posted on two portals is kept once per portal.
+    by_key: dict[tuple[str, str], JobRecord] = {}
+    with ThreadPoolExecutor(max_workers=max(len(portals), 1)) as executor:
+        for extracted in executor.map(lambda portal: portal.extract(), portals):
+            for record in extracted:
+                by_key[(record.source, record.source_id)] = record
+    records = list(by_key.values())
+    filtered = filter_jobs(records, titles)
 
     if fmt == "csv":
         load_to_csv(filtered, output)
@@ -292,22 +493,22 @@ def main() -> int:
 
 
 def filter_jobs(records: Iterable[JobRecord], titles: list[str]) -> list[JobRecord]:
-    cutoff = datetime.utcnow().timestamp() - 24 * 60 * 60
-    lowered_titles = [title.lower() for title in titles]
-    filtered: list[JobRecord] = []
-    for record in records:
-        if lowered_titles and not title_matches(record.title, lowered_titles):
-            continue
-        parsed = parse_datetime(record.date_posted)
-        if parsed is None or parsed.timestamp() < cutoff:
-            continue
-        filtered.append(record)
-    return filtered
-
-
-def title_matches(title: str, lowered_titles: list[str]) -> bool:
-    lowered_title = title.lower()
-    return any(search in lowered_title for search in lowered_titles)
+    cutoff = time.time() - 24 * 60 * 60
+    if titles:
+        # One case-insensitive alternation scans each title once, whatever the
+        # number of searched titles, without lower-casing it first.
+        search = re.compile("|".join(map(re.escape, titles)), re.IGNORECASE).search
+        matching = [record for record in records if search(record.title)]
+    else:
+        matching = list(records)
+    # Parse the batch's dates up front, once per distinct string: listings from
+    # one feed share few distinct posting dates.
+    recent = {
+        value
+        for value in {record.date_posted for record in matching}
+        if (posted := parse_timestamp(value)) is not None and posted >= cutoff
+    }
+    return [record for record in matching if record.date_posted in recent]
 
 
 if __name__ == "__main__":
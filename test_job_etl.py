@@ -0,0 +1,67 @@
+import unittest
+from datetime import datetime
+
+import job_etl
+
+STRPTIME_FORMATS = ("%Y-%m-%dT%H:%M:%S%z", "%a, %d %b %Y %H:%M:%S %z", "%Y-%m-%d")
+
+
+def parse_with_strptime(value):
+    for fmt in STRPTIME_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+class ParseDatetimeTest(unittest.TestCase):
+    def test_matches_strptime(self):
+        values = [
+            "",
+            "junk",
+            "2024-01-05T10:00:00Z",
+            "2024-01-05t10:00:00Z",
+            "2024-01-05T10:00:00z",
+            "2024-01-05T10:00:00",
+            "2024-1-5T1:2:3+0530",
+            "2024-01-05T10:00:00+05:30",
+            "2024-01-05T10:00:00-02:30",
+            "2024-01-05T10:00:00+0260",
+            "2024-01-05T10:00:00+05:30:15",
+            "2024-01-05T10:00:00+053015",
+            "2024-01-05T10:00:00+05:30:15.5",
+            "2024-01-05T10:00:00+05:3015",
+            "2024-01-05T25:00:00Z",
+            "2024-01-05T10:00:60Z",
+            "2024-13-05T10:00:00Z",
+            "Fri, 05 Jan 2024 10:00:00 +0000",
+            "fri,  5 JAN 2024 10:00:00 -05:00",
+            "Friday, 05 Jan 2024 10:00:00 +0000",
+            "Xyz, 05 Jan 2024 10:00:00 +0000",
+            "Fri, 05 Foo 2024 10:00:00 +0000",
+            "Fri, 05 Jan 2024 10:00:00 GMT",
+            "Fri, 05 Jan 2024 10:00:00 +05:30:15",
+            "Fri, 31 Feb 2024 10:00:00 +0000",
+            "2024-02-29",
+            "2023-02-29",
+            "2024-01-05 ",
+        ]
+        for value in values:
+            with self.subTest(value=value):
+                expected = parse_with_strptime(value)
+                actual = job_etl.parse_datetime(value)
+                self.assertEqual(actual, expected)
+                if expected is not None:
+                    self.assertEqual(actual.utcoffset(), expected.utcoffset())
+
+
+class NormalizeDateTest(unittest.TestCase):
+    def test_epoch_round_trips_through_parse_timestamp(self):
+        normalized = job_etl.normalize_date("1700000000")
+        self.assertEqual(normalized, "2023-11-14T22:13:20+00:00")
+        self.assertEqual(job_etl.parse_timestamp(normalized), 1700000000)
+
+
+if __name__ == "__main__":
+    unittest.main()